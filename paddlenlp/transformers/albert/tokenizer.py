@@ -14,13 +14,15 @@
 # limitations under the License.
 """Tokenization class for ALBERT model."""
 
+import itertools
 import os
 import unicodedata
 from shutil import copyfile
 
 import sentencepiece as spm
 
-from .. import PretrainedTokenizer, BertTokenizer, AddedToken
+from .. import AddedToken, BertTokenizer, PretrainedTokenizer
+from ..tokenizer_utils import _is_ascii
 
 __all__ = ["AlbertTokenizer"]
 
@@ -617,15 +619,15 @@ class AlbertEnglishTokenizer(PretrainedTokenizer):
         self.sp_model.Load(self.sentencepiece_model_file)
 
     def preprocess_text(self, inputs):
-        if self.remove_space:
-            outputs = " ".join(inputs.strip().split())
-        else:
-            outputs = inputs
+        # `str.split` without arguments already drops leading and trailing spaces
+        outputs = " ".join(inputs.split()) if self.remove_space else inputs
         outputs = outputs.replace("``", '"').replace("''", '"')
 
-        if not self.keep_accents:
+        # ASCII text has no accents to strip, skip the NFKD decomposition and
+        # the scan for combining marks, which is kept out of the interpreter loop.
+        if not self.keep_accents and not _is_ascii(outputs):
             outputs = unicodedata.normalize("NFKD", outputs)
-            outputs = "".join([c for c in outputs if not unicodedata.combining(c)])
+            outputs = "".join(itertools.filterfalse(unicodedata.combining, outputs))
         if self.do_lower_case:
             outputs = outputs.lower()
 
@@ -635,6 +637,10 @@ class AlbertEnglishTokenizer(PretrainedTokenizer):
         """Tokenize a string."""
         text = self.preprocess_text(text)
         pieces = self.sp_model.encode(text, out_type=str)
+        return self._postprocess_pieces(pieces)
+
+    def _postprocess_pieces(self, pieces):
+        """Splits the trailing comma off number pieces such as `9,`."""
         new_pieces = []
         for piece in pieces:
             if len(piece) > 1 and piece[-1] == str(",") and piece[-2].isdigit():
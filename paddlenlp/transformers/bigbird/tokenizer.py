@@ -19,12 +19,23 @@ import warnings
 import sentencepiece as spm
 
 from ..albert.tokenizer import AlbertEnglishTokenizer
+from ..tokenizer_utils import _is_ascii
 
 __all__ = ["BigBirdTokenizer"]
 
 PRETRAINED_POSITIONAL_EMBEDDINGS_SIZES = {"bigbird-base-uncased": 4096}
 
 
+def _extra_id_num(token):
+    """Returns `N` of an `<extra_id_N>` token, or None if `token` is not one."""
+    if token.startswith("<extra_id_") and token.endswith(">"):
+        num = token[10:-1]
+        # `int` also accepts signs, whitespace and underscores, only take plain ASCII digits
+        if num.isdigit() and _is_ascii(num):
+            return int(num)
+    return None
+
+
 class BigBirdTokenizer(AlbertEnglishTokenizer):
     """
     Constructs an BigBird tokenizer based on `SentencePiece <https://github.com/google/sentencepiece>`__.
@@ -77,6 +88,9 @@ class BigBirdTokenizer(AlbertEnglishTokenizer):
 
     max_model_input_sizes = PRETRAINED_POSITIONAL_EMBEDDINGS_SIZES
 
+    # whether the warning for sequences already ending with eos has been shown
+    _eos_warned = False
+
     def __init__(
         self,
         sentencepiece_model_file,
@@ -100,8 +114,46 @@ class BigBirdTokenizer(AlbertEnglishTokenizer):
 
         self.sp_model_kwargs = {} if sp_model_kwargs is None else sp_model_kwargs
 
+        self._load_sp_model()
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        # Ship the serialized model along, so that unpickling (e.g. when starting
+        # dataloader workers) needs neither to find nor to read the model file.
+        state["_sp_model_proto"] = self.sp_model.serialized_model_proto()
+        return state
+
+    def __setstate__(self, d):
+        sp_model_proto = d.pop("_sp_model_proto", None)
+        # tokenizers pickled before `extra_ids` became a property store it plainly
+        if "extra_ids" in d:
+            d["_extra_ids"] = d.pop("extra_ids")
+        self.__dict__ = d
+        if not hasattr(self, "sp_model_kwargs"):
+            self.sp_model_kwargs = {}
+
+        self._load_sp_model(sp_model_proto)
+
+    def _load_sp_model(self, sp_model_proto=None):
         self.sp_model = spm.SentencePieceProcessor(**self.sp_model_kwargs)
-        self.sp_model.Load(sentencepiece_model_file)
+        if sp_model_proto is None:
+            self.sp_model.Load(self.sentencepiece_model_file)
+        else:
+            self.sp_model.LoadFromSerializedProto(sp_model_proto)
+        # sizes are fixed once the model is loaded, avoid querying the model per token
+        self._sp_piece_size = self.sp_model.get_piece_size()
+        self._vocab_size = self._sp_piece_size + self.extra_ids
+        # Ids of the pieces `_tokenize` and `convert_tokens_to_ids` do not take as they
+        # are: pieces ending with a digit and a comma are split again by `_postprocess_pieces`
+        # and pieces looking like `<extra_id_*>` get extra ids. Unknown pieces keep the
+        # surface of their unknown characters, which ends with a comma only if the comma
+        # is unknown as well.
+        unk_id = self.sp_model.unk_id()
+        irregular_ids = {unk_id} if self.sp_model.piece_to_id(",") == unk_id else set()
+        for i, piece in enumerate(self.sp_model.id_to_piece(list(range(self._sp_piece_size)))):
+            if (len(piece) > 1 and piece[-1] == "," and piece[-2].isdigit()) or _extra_id_num(piece) is not None:
+                irregular_ids.add(i)
+        self._irregular_piece_ids = frozenset(irregular_ids)
 
     def __call__(
         self,
@@ -149,21 +201,90 @@ class BigBirdTokenizer(AlbertEnglishTokenizer):
             **kwargs,
         )
 
+    def _batch_encode_plus(
+        self, batch_text_or_text_pairs, is_split_into_words=False, return_offsets_mapping=False, **kwargs
+    ):
+        if (
+            not is_split_into_words
+            and not return_offsets_mapping
+            and not self.do_lower_case
+            and all(isinstance(text, str) for text in batch_text_or_text_pairs)
+        ):
+            batch_text_or_text_pairs = self._pretokenize_batch(batch_text_or_text_pairs)
+        return super()._batch_encode_plus(
+            batch_text_or_text_pairs,
+            is_split_into_words=is_split_into_words,
+            return_offsets_mapping=return_offsets_mapping,
+            **kwargs,
+        )
+
+    def _pretokenize_batch(self, texts):
+        """
+        Converts the texts of a batch which contain no added tokens to ids with
+        one call of the sentencepiece model. The other texts are kept as is and
+        are tokenized one by one as usual.
+        """
+        no_split_tokens = self.unique_no_split_tokens
+        if no_split_tokens:
+            # `tokens_trie` splits a text if and only if it holds any of the tokens
+            search = re.compile("|".join(re.escape(token) for token in no_split_tokens)).search
+            plain_positions = [i for i, text in enumerate(texts) if search(text) is None]
+        else:
+            plain_positions = list(range(len(texts)))
+        if not plain_positions:
+            return texts
+
+        outputs = list(texts)
+        batch_ids = self._tokenize_batch([texts[i] for i in plain_positions])
+        for i, ids in zip(plain_positions, batch_ids):
+            # empty ids are not accepted as pre-tokenized inputs
+            if ids:
+                outputs[i] = (ids, None)
+        return outputs
+
+    def _tokenize_batch(self, texts):
+        """Tokenizes a batch of texts to ids with one call of the sentencepiece model."""
+        texts = [self.preprocess_text(text) for text in texts]
+        batch_ids = self.sp_model.encode(texts, out_type=int)
+        # Added tokens found among the pieces are mapped apart from the sentencepiece model
+        # as well, the few texts holding any irregular id are tokenized like `_tokenize`.
+        unk_id = self.sp_model.unk_id()
+        irregular_ids = self._irregular_piece_ids.union(
+            [i for i in self.sp_model.piece_to_id(list(self.added_tokens_encoder)) if i != unk_id]
+        )
+        for i, ids in enumerate(batch_ids):
+            if not irregular_ids.isdisjoint(ids):
+                pieces = self._postprocess_pieces(self.sp_model.encode(texts[i], out_type=str))
+                batch_ids[i] = self.convert_tokens_to_ids(pieces)
+        return batch_ids
+
     @property
     def vocab_size(self):
-        return len(self.sp_model) + self.extra_ids
+        return self._vocab_size
 
-    def _add_eos_if_not_present(self, token_ids):
-        """Do not add eos again if user already added it."""
-        if len(token_ids) > 0 and token_ids[-1] == self.eos_token_id:
-            warnings.warn(
-                f"This sequence already has {self.eos_token}. In future versions this behavior may lead to duplicated eos tokens being added."
-            )
-            return token_ids
-        else:
-            return token_ids + [self.eos_token_id]
+    @property
+    def extra_ids(self):
+        return self._extra_ids
+
+    @extra_ids.setter
+    def extra_ids(self, extra_ids):
+        self._extra_ids = extra_ids
+        # `<extra_id_*>` ids count down from the end of the vocab, thus refresh
+        # the vocab size once the model is loaded.
+        if hasattr(self, "_sp_piece_size"):
+            self._vocab_size = self._sp_piece_size + extra_ids
+
+    def _warn_eos_already_present(self):
+        # Pre-tokenized data often ends with eos on every example, warn only once
+        # per process rather than formatting and filtering a warning each time.
+        if BigBirdTokenizer._eos_warned:
+            return
+        BigBirdTokenizer._eos_warned = True
+        warnings.warn(
+            f"This sequence already has {self.eos_token}. In future versions this behavior may lead to duplicated eos tokens being added."
+        )
 
-    def build_inputs_with_special_tokens(self, token_ids_0, token_ids_1):
+    def build_inputs_with_special_tokens(self, token_ids_0, token_ids_1=None):
         """
         Build model inputs from a sequence or a pair of sequence.
 
@@ -182,12 +303,20 @@ class BigBirdTokenizer(AlbertEnglishTokenizer):
             List[int]: List of input_id with the appropriate special tokens.
 
         """
-        token_ids_0 = self._add_eos_if_not_present(token_ids_0)
-        if token_ids_1 is None:
-            return token_ids_0
-        else:
-            token_ids_1 = self._add_eos_if_not_present(token_ids_1)
-            return token_ids_0 + token_ids_1
+        # Do not add eos again if user already added it. Fill a single output
+        # list rather than copying the sequences on every concatenation.
+        # `eos_token_id` walks the special tokens map, look it up only once
+        eos_id = self.eos_token_id
+        output = []
+        for token_ids in (token_ids_0, token_ids_1):
+            if token_ids is None:
+                continue
+            output.extend(token_ids)
+            if len(token_ids) > 0 and token_ids[-1] == eos_id:
+                self._warn_eos_already_present()
+            else:
+                output.append(eos_id)
+        return output
 
     def build_offset_mapping_with_special_tokens(self, offset_mapping_0, offset_mapping_1=None):
         """
@@ -225,10 +354,9 @@ class BigBirdTokenizer(AlbertEnglishTokenizer):
             List[int]: List of token_type_id according to the given sequence(s).
 
         """
-        eos = [self.eos_token_id]
         if token_ids_1 is None:
-            return len(token_ids_0 + eos) * [0]
-        return len(token_ids_0 + eos + token_ids_1 + eos) * [0]
+            return [0] * (len(token_ids_0) + 1)
+        return [0] * (len(token_ids_0) + len(token_ids_1) + 2)
 
     def get_special_tokens_mask(self, token_ids_0, token_ids_1=None, already_has_special_tokens=False):
         """
@@ -253,36 +381,106 @@ class BigBirdTokenizer(AlbertEnglishTokenizer):
             )
 
         # normal case: some special tokens
+        len_0 = len(token_ids_0)
         if token_ids_1 is None:
-            return ([0] * len(token_ids_0)) + [1]
-        return ([0] * len(token_ids_0)) + [1] + ([0] * len(token_ids_1)) + [1]
+            mask = [0] * (len_0 + 1)
+        else:
+            mask = [0] * (len_0 + len(token_ids_1) + 2)
+        mask[len_0] = 1
+        mask[-1] = 1
+        return mask
+
+    def convert_tokens_to_ids(self, tokens):
+        """
+        Converts a token (str) or a sequence of tokens to ids. Plain sentencepiece
+        pieces are converted by one batched call of the sentencepiece model,
+        added tokens and `<extra_id_*>` tokens are resolved in place.
+        """
+        if tokens is None or isinstance(tokens, str):
+            return super().convert_tokens_to_ids(tokens)
+
+        last_id = self._vocab_size - 1
+        ids = [None] * len(tokens)
+        piece_positions = []
+        pieces = []
+        for i, token in enumerate(tokens):
+            if not isinstance(token, str) or token in self.added_tokens_encoder:
+                ids[i] = self._convert_token_to_id_with_added_voc(token)
+                continue
+            num = _extra_id_num(token)
+            if num is not None:
+                ids[i] = last_id - num
+            else:
+                piece_positions.append(i)
+                pieces.append(token)
+        for i, token_id in zip(piece_positions, self.sp_model.piece_to_id(pieces)):
+            ids[i] = token_id
+        return ids
+
+    def convert_ids_to_tokens(self, ids, skip_special_tokens=False):
+        """
+        Converts an id (int) or a sequence of ids to tokens. Ids of the sentencepiece
+        model are converted by one batched call of the sentencepiece model,
+        added tokens and `<extra_id_*>` ids are resolved in place.
+        """
+        if isinstance(ids, int):
+            return super().convert_ids_to_tokens(ids)
+
+        all_special_ids = set(self.all_special_ids) if skip_special_tokens else ()
+        piece_size = self._sp_piece_size
+        last_id = self._vocab_size - 1
+        tokens = []
+        piece_positions = []
+        piece_ids = []
+        for index in ids:
+            index = int(index)
+            if index in all_special_ids:
+                continue
+            if index in self.added_tokens_decoder:
+                tokens.append(self.added_tokens_decoder[index])
+            elif 0 <= index < piece_size:
+                piece_positions.append(len(tokens))
+                piece_ids.append(index)
+                tokens.append(None)
+            elif index >= piece_size:
+                tokens.append(f"<extra_id_{last_id - index}>")
+            else:
+                tokens.append(self._convert_id_to_token(index))
+        for i, token in zip(piece_positions, self.sp_model.id_to_piece(piece_ids)):
+            tokens[i] = token
+        return tokens
 
     def convert_tokens_to_string(self, tokens):
         """Converts a sequence of tokens (string) in a single string."""
+        # `all_special_tokens` walks the special tokens map, look it up only once
+        special_tokens = frozenset(self.all_special_tokens)
         current_sub_tokens = []
-        out_string = ""
+        out_pieces = []
         for token in tokens:
             # make sure that special tokens are not decoded using sentencepiece model
-            if token in self.all_special_tokens:
-                out_string += self.sp_model.decode_pieces(current_sub_tokens) + token + " "
-                current_sub_tokens = []
+            if token in special_tokens:
+                if current_sub_tokens:
+                    out_pieces.append(self.sp_model.decode_pieces(current_sub_tokens))
+                    current_sub_tokens = []
+                out_pieces.append(token)
+                out_pieces.append(" ")
             else:
                 current_sub_tokens.append(token)
-        out_string += self.sp_model.decode_pieces(current_sub_tokens)
-        return out_string.strip()
+        if current_sub_tokens:
+            out_pieces.append(self.sp_model.decode_pieces(current_sub_tokens))
+        return "".join(out_pieces).strip()
 
     def _convert_token_to_id(self, token):
         """Converts a token (str) in an id using the vocab."""
-        if token.startswith("<extra_id_"):
-            match = re.match(r"<extra_id_(\d+)>", token)
-            num = int(match.group(1))
-            return self.vocab_size - num - 1
+        num = _extra_id_num(token)
+        if num is not None:
+            return self._vocab_size - num - 1
         return self.sp_model.piece_to_id(token)
 
     def _convert_id_to_token(self, index):
         """Converts an index (integer) in a token (str) using the vocab."""
-        if index < self.sp_model.get_piece_size():
+        if index < self._sp_piece_size:
             token = self.sp_model.IdToPiece(index)
         else:
-            token = f"<extra_id_{self.vocab_size - 1 - index}>"
+            token = f"<extra_id_{self._vocab_size - 1 - index}>"
         return token
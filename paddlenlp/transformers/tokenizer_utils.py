@@ -146,6 +146,21 @@ def _is_start_of_word(text):
     return bool(_is_control(first_char) | _is_punctuation(first_char) | _is_whitespace(first_char))
 
 
+def _is_ascii(text):
+    """Check whether `text` only contains ASCII characters."""
+    # `str.isascii` is only available since Python 3.7
+    return text.isascii() if hasattr(text, "isascii") else all(ord(char) < 128 for char in text)
+
+
+def _lower_case(text):
+    """Lowercase `text` character by character, using `str.lower` directly on ASCII text."""
+    if _is_ascii(text):
+        return text.lower()
+    # Some non-ASCII characters (such as the final sigma) are lowercased
+    # depending on their context by `str.lower`, keep them char-wise.
+    return "".join([char.lower() for char in text])
+
+
 def _insert_one_token_to_ordered_list(token_list: List[str], new_token: str):
     """
     Inserts one token to an ordered list if it does not already exist. Note: token_list must be sorted.
@@ -730,8 +745,14 @@ class PretrainedTokenizer(PretrainedTokenizerBase):
             escaped_special_toks = [
                 re.escape(s_tok) for s_tok in (self.unique_no_split_tokens + self.all_special_tokens)
             ]
-            pattern = r"(" + r"|".join(escaped_special_toks) + r")|" + r"(.+?)"
-            text = re.sub(pattern, lambda m: m.groups()[0] or m.groups()[1].lower(), text)
+            if escaped_special_toks:
+                pattern = r"(" + r"|".join(escaped_special_toks) + r")"
+                # odd chunks are the special tokens captured by the pattern
+                text = "".join(
+                    [chunk if i % 2 else _lower_case(chunk) for i, chunk in enumerate(re.split(pattern, text))]
+                )
+            else:
+                text = _lower_case(text)
 
         no_split_token = set(self.unique_no_split_tokens)
         tokens = self.tokens_trie.split(text)
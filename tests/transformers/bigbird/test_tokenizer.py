@@ -303,3 +303,73 @@ class BigBirdTokenizationTest(TokenizerTesterMixin, unittest.TestCase):
             )
             self.assertEqual(len(encoding["input_ids"]), 3)
             self.assertEqual(len(encoding["offset_mapping"]), 3)
+
+    def test_special_tokens_follow_added_tokens(self):
+        tokenizer = self.get_tokenizer()
+        tokenizer.add_special_tokens({"eos_token": "<new_eos>"})
+        new_eos_id = tokenizer.convert_tokens_to_ids("<new_eos>")
+
+        self.assertEqual(tokenizer.build_inputs_with_special_tokens([285, 46]), [285, 46, new_eos_id])
+        self.assertEqual(tokenizer.convert_tokens_to_string(["▁This", "<new_eos>"]), "This<new_eos>")
+
+    def test_special_tokens_follow_direct_assignment(self):
+        tokenizer = self.get_tokenizer()
+        tokenizer.eos_token = "<pad>"
+        self.assertEqual(tokenizer.build_inputs_with_special_tokens([5]), [5, 0])
+
+        tokenizer = self.get_tokenizer()
+        tokenizer.eos_token_id = 0
+        self.assertEqual(tokenizer.build_inputs_with_special_tokens([5]), [5, 0])
+
+        tokenizer = self.get_tokenizer()
+        tokenizer.additional_special_tokens = ["▁the"]
+        self.assertEqual(tokenizer.convert_tokens_to_string(["▁a", "▁the", "▁b"]), "a▁the b")
+
+    def test_batch_encode_matches_single_encode(self):
+        tokenizer = self.get_tokenizer()
+        texts = ["This is a test", "I was born in 92000, and this is falsé.", "hi</s>", ""]
+
+        batch_input_ids = tokenizer(texts)["input_ids"]
+        self.assertListEqual(batch_input_ids, [tokenizer(text)["input_ids"] for text in texts])
+
+    def test_batch_encode_matches_single_encode_with_added_tokens(self):
+        tokenizer = self.get_tokenizer()
+        tokenizer.add_tokens(["newtok"])
+        texts = ["This is a newtok test", "This is a test", "newtok"]
+
+        batch_input_ids = tokenizer(texts)["input_ids"]
+        self.assertListEqual(batch_input_ids, [tokenizer(text)["input_ids"] for text in texts])
+
+    def test_extra_ids_update_vocab_size(self):
+        tokenizer = self.get_tokenizer()
+        tokenizer.extra_ids = 10
+
+        self.assertEqual(tokenizer.vocab_size, 1_010)
+        self.assertEqual(tokenizer.convert_tokens_to_ids("<extra_id_0>"), 1_009)
+        self.assertEqual(tokenizer.convert_ids_to_tokens(1_009), "<extra_id_0>")
+
+    def test_setstate_with_plain_extra_ids(self):
+        tokenizer = self.get_tokenizer()
+        tokenizer.extra_ids = 10
+        state = tokenizer.__getstate__()
+        state.pop("_sp_model_proto")
+        state["extra_ids"] = state.pop("_extra_ids")
+
+        restored = BigBirdTokenizer.__new__(BigBirdTokenizer)
+        restored.__setstate__(state)
+
+        self.assertEqual(restored.extra_ids, 10)
+        self.assertEqual(restored.vocab_size, 1_010)
+        self.assertEqual(restored.convert_tokens_to_ids("<extra_id_0>"), 1_009)
+
+    def test_malformed_extra_ids_are_unknown(self):
+        tokenizer = self.get_tokenizer()
+        tokens = ["<extra_id_-1>", "<extra_id_ 5>", "<extra_id_+5>", "<extra_id_1_0>", "<extra_id_>", "<extra_id_٥>"]
+
+        for token in tokens:
+            self.assertEqual(tokenizer.convert_tokens_to_ids(token), tokenizer.unk_token_id)
+        self.assertListEqual(tokenizer.convert_tokens_to_ids(tokens), [tokenizer.unk_token_id] * len(tokens))
+
+    def test_convert_tokens_to_ids_keeps_none(self):
+        tokenizer = self.get_tokenizer()
+        self.assertListEqual(tokenizer.convert_tokens_to_ids(["▁a", None]), [10, None])
@@ -19,7 +19,7 @@ import tempfile
 import unittest
 
 from paddlenlp.transformers import BertTokenizer
-from paddlenlp.transformers.tokenizer_utils import PretrainedTokenizer
+from paddlenlp.transformers.tokenizer_utils import PretrainedTokenizer, _lower_case
 from paddlenlp.utils.env import TOKENIZER_CONFIG_NAME
 
 
@@ -33,6 +33,14 @@ class SubEmptyTokenizer(EmptyTokenizer):
         super().__init__(a=c, b=d)
 
 
+class LowerCaseTokenizer(PretrainedTokenizer):
+    def __init__(self, do_lower_case=True, unk_token=None):
+        self.do_lower_case = do_lower_case
+
+    def _tokenize(self, text):
+        return [text]
+
+
 class TokenizerUtilsTest(unittest.TestCase):
     def test_multi_inherit(self):
         tokenizer = SubEmptyTokenizer()
@@ -60,3 +68,19 @@ class TokenizerUtilsTest(unittest.TestCase):
             self.assertTrue(os.path.exists(os.path.join(tempdir, model_name, TOKENIZER_CONFIG_NAME)))
             # check against double appending model_name in cache_dir
             self.assertFalse(os.path.exists(os.path.join(tempdir, model_name, model_name)))
+
+    def test_lower_case(self):
+        self.assertEqual(_lower_case("HeLLo"), "hello")
+        # non-ASCII text is lowercased char by char, without context-dependent final sigma
+        self.assertEqual(_lower_case("ΟΔΟΣ"), "οδοσ")
+
+    def test_tokenize_lower_case_keeps_special_tokens(self):
+        tokenizer = LowerCaseTokenizer(unk_token="[UNK]")
+
+        self.assertListEqual(tokenizer.tokenize("HeLLo [UNK] ΟΔΟΣ"), ["hello [UNK] οδοσ"])
+
+    def test_tokenize_lower_case_without_special_tokens(self):
+        tokenizer = LowerCaseTokenizer()
+
+        self.assertListEqual(tokenizer.all_special_tokens, [])
+        self.assertListEqual(tokenizer.tokenize("HeLLo ΟΔΟΣ"), ["hello οδοσ"])